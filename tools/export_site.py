@@ -11,19 +11,83 @@ from __future__ import annotations
 
 import argparse
 import datetime as dt
+import functools
 import hashlib
 import html
+import itertools
+import json
+import math
+import operator
+import os
 import re
 import shutil
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, Iterable, List, Mapping, Optional
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Union,
+)
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:  # libyaml bindings are optional
+    from yaml import SafeLoader as YamlLoader
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows; reflinks fall back to copying
+    fcntl = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib parser is used instead
+    orjson = None
+
 # Regex lifted from the original scraper to mirror file hashing behaviour.
 HASH_EXT_RE = re.compile(r"(\.[^./?&=\-]{1,5})$")
 STRIP_TAG_RE = re.compile(r"<[^>]+>")
+# Equivalent of strptime("%a %b %d %H:%M:%S %Y") without its per-call setup.
+DATE_RE = re.compile(
+    r"([A-Za-z]{3})\s+([A-Za-z]{3})\s+(\d{1,2})\s+"
+    r"(\d{1,2}):(\d{1,2}):(\d{1,2})\s+(\d{4})\Z"
+)
+WEEKDAYS = frozenset(("mon", "tue", "wed", "thu", "fri", "sat", "sun"))
+MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
 INDEX_THREADS_PER_FOLDER = 6
+EPOCH = dt.datetime(1970, 1, 1)
+# Same output as html.escape(quote=True), without its chain of str.replace calls.
+HTML_ESCAPE_TABLE = str.maketrans(
+    {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#x27;"}
+)
+COPY_BUFFER_SIZE = 256 * 1024
+THREAD_WRITE_BUFFER_SIZE = 256 * 1024
+MANIFEST_NAME = ".manifest.json"
+CACHE_DIR_NAME = ".cache"
+DIR_FD_SUPPORTED = os.open in os.supports_dir_fd and os.stat in os.supports_dir_fd
+# Buffers per writev call, which refuses more than this; 0 without writev.
+IOV_MAX = 0
+if hasattr(os, "writev"):
+    try:
+        IOV_MAX = os.sysconf("SC_IOV_MAX")
+    except (ValueError, OSError):
+        pass
+    if IOV_MAX <= 0:  # indeterminate
+        IOV_MAX = 1024
+# ioctl request number for cloning a file's extents (linux/fs.h).
+FICLONE = 0x40049409
 
 STYLE_CSS = """\
 :root {
@@ -476,7 +540,23 @@ footer {
 }
 """
 
+# The stylesheet is written once per export; strip the indentation and blank
+# lines that only exist for readability here.
+STYLE_CSS_COMPACT = "".join(
+    f"{line.strip()}\n" for line in STYLE_CSS.splitlines() if line.strip()
+)
+
+
+@functools.lru_cache(maxsize=16384)
+def escape_repeated(text: str) -> str:
+    """
+    Escape text that recurs across messages and pages (author names, folder
+    and forum titles, reply ids) once per process instead of on every use.
+    """
+    return text.translate(HTML_ESCAPE_TABLE)
 
+
+@functools.lru_cache(maxsize=None)
 def slugify(value: str) -> str:
     if not value:
         return "forum"
@@ -488,10 +568,9 @@ def slugify(value: str) -> str:
 def strip_html(text: Optional[str]) -> str:
     if text is None:
         return ""
-    plain = STRIP_TAG_RE.sub(" ", text)
-    plain = html.unescape(plain)
-    plain = re.sub(r"\s+", " ", plain)
-    return plain.strip()
+    plain = html.unescape(STRIP_TAG_RE.sub(" ", text))
+    # split() drops the same whitespace runs a \s+ collapse plus strip() would.
+    return " ".join(plain.split())
 
 
 def build_snippet(text: Optional[str], max_length: int = 180) -> str:
@@ -506,10 +585,6 @@ def build_snippet(text: Optional[str], max_length: int = 180) -> str:
     return truncated + "..."
 
 
-def pluralize(word: str, count: int) -> str:
-    return word if count == 1 else f"{word}s"
-
-
 def format_time_component(timestamp: dt.datetime) -> str:
     hour = timestamp.hour % 12 or 12
     suffix = "AM" if timestamp.hour < 12 else "PM"
@@ -535,6 +610,7 @@ def format_folder_date(timestamp: Optional[dt.datetime]) -> str:
     return f"{timestamp.month:02d}/{timestamp.day:02d}/{timestamp.year:04d}"
 
 
+@functools.lru_cache(maxsize=8192)
 def format_name_html(
     name: Optional[str],
     primary_class: str,
@@ -559,12 +635,16 @@ def format_name_html(
                 extra = segment
     if local_status and local_status.lower() == "unread":
         local_status = "unread"
-    primary_html = f'<span class="{primary_class}">{html.escape(primary)}</span>'
+    primary_html = (
+        f'<span class="{primary_class}">{escape_repeated(primary)}</span>'
+    )
     extra_html = (
-        f' <span class="msg-recipient-extra">{html.escape(extra)}</span>' if extra else ""
+        f' <span class="msg-recipient-extra">{escape_repeated(extra)}</span>'
+        if extra
+        else ""
     )
     status_html = (
-        f' <span class="msg-status">{html.escape(local_status)}</span>'
+        f' <span class="msg-status">{escape_repeated(local_status)}</span>'
         if local_status
         else ""
     )
@@ -572,22 +652,21 @@ def format_name_html(
 
 
 def render_thread_card(thread: Mapping, *, href_prefix: str) -> str:
-    title = html.escape(thread.get("title") or f"Thread {thread.get('id')}")
+    # Card text arrives escaped from process_thread.
+    title = thread["title_html"]
     link = f"{href_prefix}threads/{thread['id']}.html"
 
-    author = thread.get("first_author")
-    meta_html = (
-        f'<div class="thread-card-meta">By {html.escape(author)}</div>' if author else ""
-    )
+    author = thread["first_author_html"]
+    meta_html = f'<div class="thread-card-meta">By {author}</div>' if author else ""
 
-    snippet = thread.get("snippet")
+    snippet = thread["snippet_html"]
     snippet_html = (
-        f'<p class="thread-card-snippet">{html.escape(snippet)}</p>' if snippet else ""
+        f'<p class="thread-card-snippet">{snippet}</p>' if snippet else ""
     )
 
     stats_parts = []
     count = thread.get("message_count", 0)
-    stats_parts.append(f"{count} {pluralize('message', count)}")
+    stats_parts.append(f"{count} message{'' if count == 1 else 's'}")
 
     last_timestamp = format_card_timestamp(thread.get("last_date"))
     if last_timestamp:
@@ -599,7 +678,7 @@ def render_thread_card(thread: Mapping, *, href_prefix: str) -> str:
 
     stats_text = " | ".join(stats_parts)
     stats_html = (
-        f'<div class="thread-card-stats">{html.escape(stats_text)}</div>'
+        f'<div class="thread-card-stats">{stats_text.translate(HTML_ESCAPE_TABLE)}</div>'
         if stats_text
         else ""
     )
@@ -618,6 +697,13 @@ def render_thread_card(thread: Mapping, *, href_prefix: str) -> str:
 
 
 
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer: {value}")
+    return number
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Export Delphi Forums YAML threads into a standalone HTML archive."
@@ -637,14 +723,90 @@ def parse_args() -> argparse.Namespace:
         default="Delphi Forum Archive",
         help="Title to display for the exported forum (default: %(default)s)",
     )
+    parser.add_argument(
+        "--jobs",
+        type=positive_int,
+        default=None,
+        help="Number of worker processes used to render threads (default: one per CPU)",
+    )
+    parser.add_argument(
+        "--copy-mode",
+        choices=["link", "reflink", "copy"],
+        default="link",
+        help="How captured binaries are placed in the export (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--cache-format",
+        choices=["json"],
+        default=None,
+        help="Keep parsed store files as sidecars in this format for faster re-exports",
+    )
     return parser.parse_args()
 
 
-def load_yaml(path: Path) -> Mapping:
-    with path.open("r", encoding="utf-8") as handle:
-        return yaml.safe_load(handle) or {}
-
-
+def load_yaml(path: str, cache_dir: Optional[str] = None) -> Mapping:
+    """
+    Parse a YAML store file. With a cache_dir, a JSON copy is kept there and
+    preferred on later runs while it is newer than its source. The copies
+    stay out of the store, whose newest thread mtime drives the scraper's
+    --refresh auto window.
+    """
+    cache_path = None
+    if cache_dir is not None:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        cache_path = os.path.join(cache_dir, f"{stem}.json")
+        try:
+            # Strictly newer: a YAML rewritten within the same mtime tick as
+            # its copy must not keep serving the copy.
+            if os.stat(cache_path).st_mtime_ns > os.stat(path).st_mtime_ns:
+                with open(cache_path, "rb") as cached:
+                    return _json_loads(cached.read()) or {}
+        except (OSError, ValueError):
+            pass
+
+    with open(path, "r", encoding="utf-8") as handle:
+        data = yaml.load(handle, Loader=YamlLoader) or {}
+
+    if cache_path is not None:
+        try:
+            encoded = _json_dumps(data)
+            with open(cache_path, "wb") as cached:
+                cached.write(encoded)
+        except (OSError, TypeError, ValueError):
+            # Unwritable store or values JSON cannot round-trip (dates).
+            pass
+    return data
+
+
+def _json_loads(data: bytes) -> Mapping:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(data: Mapping) -> bytes:
+    if orjson is not None:
+        # Refuse dates rather than silently turning them into strings.
+        return orjson.dumps(data, option=orjson.OPT_PASSTHROUGH_DATETIME)
+    _check_json_compatible(data)
+    return json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+
+def _check_json_compatible(value: object) -> None:
+    """Refuse what orjson refuses but json.dumps would quietly coerce."""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if not isinstance(key, str):
+                raise TypeError("Dict key must be str")
+            _check_json_compatible(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _check_json_compatible(item)
+    elif isinstance(value, int) and not -(2**63) <= value < 2**64:
+        raise TypeError("Integer exceeds 64-bit range")
+
+
+@functools.lru_cache(maxsize=None)
 def hash_for_url(url: str) -> str:
     """Mirror the scraper's hashing logic so local files can be resolved."""
     file_part = url
@@ -657,200 +819,259 @@ def hash_for_url(url: str) -> str:
     return f"{digest}{ext}"
 
 
-def ensure_local_asset(url: str, store_files: Path, export_files: Path) -> Optional[str]:
+def reflink_file(source: Path, destination: Path) -> None:
+    """Clone source into destination on copy-on-write filesystems."""
+    if fcntl is None:
+        raise OSError("reflinks are not supported on this platform")
+    with source.open("rb") as src, destination.open("wb") as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        except OSError:
+            dst.close()
+            destination.unlink()
+            raise
+    shutil.copystat(source, destination)
+
+
+def copy_file(source: Path, destination: Path) -> None:
+    with source.open("rb") as src, destination.open("wb") as dst:
+        shutil.copyfileobj(src, dst, COPY_BUFFER_SIZE)
+    shutil.copystat(source, destination)
+
+
+def place_asset(source: Path, destination: Path, copy_mode: str) -> None:
+    """
+    Materialise a store binary in the export. "link" tries a hardlink, then a
+    reflink, then a plain copy; "reflink" skips the hardlink attempt.
+    """
+    if copy_mode == "link":
+        try:
+            os.link(source, destination)
+            return
+        except FileExistsError:
+            # Already placed by an earlier export.
+            return
+        except OSError:
+            pass
+    if copy_mode in ("link", "reflink"):
+        try:
+            reflink_file(source, destination)
+            return
+        except OSError:
+            pass
+    copy_file(source, destination)
+
+
+def list_file_names(directory: Path) -> Set[str]:
+    if not directory.is_dir():
+        return set()
+    with os.scandir(directory) as entries:
+        return {entry.name for entry in entries if entry.is_file()}
+
+
+def mirror_store_files(
+    store_files: Path, export_files: Path, store_hashes: Set[str], copy_mode: str
+) -> None:
+    """Place every captured binary into the export ahead of rendering."""
+    for hashed_name in store_hashes - list_file_names(export_files):
+        place_asset(store_files / hashed_name, export_files / hashed_name, copy_mode)
+
+
+def ensure_local_asset(url: Optional[str], store_hashes: Set[str]) -> Optional[str]:
     """
-    Copy the hashed binary for a remote URL into the export folder if present.
-    Returns a relative path suitable for embedding in HTML. Falls back to None
-    when the binary was not captured.
+    Resolve a remote URL to its hashed binary in the export folder. Returns a
+    relative path suitable for embedding in HTML. Falls back to None when the
+    binary was not captured. main() mirrors store/files into the export before
+    rendering, so this is only a name lookup.
     """
     if not url:
         return None
 
     hashed_name = hash_for_url(url)
-    source = store_files / hashed_name
-    if not source.exists():
+    if hashed_name not in store_hashes:
         return None
-
-    destination = export_files / hashed_name
-    destination.parent.mkdir(parents=True, exist_ok=True)
-    if not destination.exists():
-        shutil.copy2(source, destination)
     return f"files/{hashed_name}"
 
 
+@functools.lru_cache(maxsize=65536)
 def parse_date(raw: Optional[str]) -> Optional[dt.datetime]:
+    """Parse ctime-style stamps such as "Mon Jan  5 13:04:59 2009"."""
     if not raw:
         return None
 
-    for fmt in ("%a %b %d %H:%M:%S %Y", "%a %b %e %H:%M:%S %Y"):
-        try:
-            return dt.datetime.strptime(raw, fmt)
-        except ValueError:
-            continue
-    return None
-
+    match = DATE_RE.match(raw)
+    if not match:
+        return None
+    weekday, month_name, day, hour, minute, second, year = match.groups()
+    month = MONTHS.get(month_name.lower())
+    if month is None or weekday.lower() not in WEEKDAYS:
+        return None
+    try:
+        return dt.datetime(
+            int(year), month, int(day), int(hour), int(minute), int(second)
+        )
+    except ValueError:
+        return None
 
-def render_index_html(
-    forum_title: str, description: str, folders: List[Dict]
-) -> str:
-    sections: List[str] = []
-    for folder in folders:
-        threads = folder.get("threads") or []
-        if not threads:
-            continue
 
-        preview_threads = threads[:INDEX_THREADS_PER_FOLDER]
-        cards = "".join(
-            render_thread_card(thread, href_prefix="") for thread in preview_threads
-        )
+def render_folder_preview(folder: Mapping) -> str:
+    threads = folder["threads"]
+    preview_threads = threads[:INDEX_THREADS_PER_FOLDER]
+    cards = "".join(
+        render_thread_card(thread, href_prefix="") for thread in preview_threads
+    )
 
-        thread_total = len(threads)
-        message_total = sum(t.get("message_count", 0) for t in threads)
-        subtitle_parts = [f"{thread_total} {pluralize('thread', thread_total)}"]
-        if message_total:
-            subtitle_parts.append(f"{message_total} {pluralize('message', message_total)}")
-        subtitle = " | ".join(subtitle_parts)
-
-        section_html = (
-            '<section class="folder-preview">'
-            '<div class="folder-header">'
-            "<div>"
-            f"<h2>{html.escape(folder['name'])}</h2>"
-            f'<p class="folder-subtitle">{html.escape(subtitle)}</p>'
-            "</div>"
-            f'<a class="folder-show-all" href="folders/{folder["slug"]}.html">Show All</a>'
-            "</div>"
-            f'<ul class="thread-list">{cards}</ul>'
-            "</section>"
+    thread_total = len(threads)
+    message_total = sum(t.get("message_count", 0) for t in threads)
+    subtitle_parts = [f"{thread_total} thread{'' if thread_total == 1 else 's'}"]
+    if message_total:
+        subtitle_parts.append(
+            f"{message_total} message{'' if message_total == 1 else 's'}"
         )
-        sections.append(section_html)
+    subtitle = " | ".join(subtitle_parts)
 
-    sections_html = (
-        "".join(sections)
-        if sections
-        else '<p class="notice">No forums were captured in this archive.</p>'
+    return (
+        '<section class="folder-preview">'
+        '<div class="folder-header">'
+        "<div>"
+        f"<h2>{escape_repeated(folder['name'])}</h2>"
+        f'<p class="folder-subtitle">{html.escape(subtitle)}</p>'
+        "</div>"
+        f'<a class="folder-show-all" href="folders/{folder["slug"]}.html">Show All</a>'
+        "</div>"
+        f'<ul class="thread-list">{cards}</ul>'
+        "</section>"
     )
 
+
+def render_index_html(
+    forum_title: str, description: str, folders: List[Dict], generated_at: str
+) -> str:
+    sections_html = "".join(
+        render_folder_preview(folder) for folder in folders if folder.get("threads")
+    ) or '<p class="notice">No forums were captured in this archive.</p>'
+
     return f"""<!DOCTYPE html>
 <html lang="en">
 <head>
   <meta charset="utf-8"/>
   <meta name="viewport" content="width=device-width, initial-scale=1"/>
-  <title>{html.escape(forum_title)}</title>
+  <title>{escape_repeated(forum_title)}</title>
   <link rel="stylesheet" href="assets/style.css"/>
 </head>
 <body>
   <header>
-    <h1>{html.escape(forum_title)}</h1>
+    <h1>{escape_repeated(forum_title)}</h1>
     <p>{html.escape(description)}</p>
   </header>
   <main>
     {sections_html}
   </main>
-  <footer>
-    Export generated on {dt.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}.
+{render_page_footer(generated_at)}"""
+
+
+def render_page_footer(generated_at: str) -> str:
+    return f"""  <footer>
+    Export generated on {generated_at}.
   </footer>
 </body>
 </html>
 """
 
 
-def render_folder_html(
-    forum_title: str,
-    folder: Mapping,
-) -> str:
+def iter_folder_html(forum_title: str, folder: Mapping) -> Iterator[str]:
+    """
+    Yield a folder page up to its footer: page head, one chunk per row, then
+    the close of the page body. The footer carries the export timestamp and
+    is left to the caller, so the rest can be compared across exports.
+    """
     threads = folder.get("threads") or []
     thread_total = len(threads)
     message_total = sum(t.get("message_count", 0) for t in threads)
 
     subtitle_parts = []
     if thread_total:
-        subtitle_parts.append(f"{thread_total} {pluralize('thread', thread_total)}")
+        subtitle_parts.append(
+            f"{thread_total} thread{'' if thread_total == 1 else 's'}"
+        )
     if message_total:
-        subtitle_parts.append(f"{message_total} {pluralize('message', message_total)}")
+        subtitle_parts.append(
+            f"{message_total} message{'' if message_total == 1 else 's'}"
+        )
     subtitle = " | ".join(subtitle_parts) or "No captured content."
 
-    if threads:
-        threads_sorted = sorted(
-            threads,
-            key=lambda t: (
-                t.get("first_date") or dt.datetime.max,
-                t.get("id"),
-            ),
-        )
-        rows = []
-        for thread in threads_sorted:
-            thread_id = html.escape(str(thread.get("id")))
-            title = html.escape(thread.get("title") or f"Thread {thread_id}")
-            first_date = format_folder_date(thread.get("first_date"))
-            author = html.escape(thread.get("first_author") or "Unknown")
-            replies = max(thread.get("message_count", 0) - 1, 0)
-            link = f'../threads/{thread["id"]}.html'
-            rows.append(
-                "<tr>"
-                f'<td class="thread-id">{thread_id}</td>'
-                f'<td><a href="{link}">{title}</a></td>'
-                f"<td>{first_date}</td>"
-                f"<td>{author}</td>"
-                f"<td>{replies}</td>"
-                "</tr>"
-            )
-        content_html = (
-            '<table class="folder-table">'
-            "<thead>"
-            "<tr>"
-            "<th>Thread ID</th>"
-            "<th>Message Title</th>"
-            "<th>Date Posted</th>"
-            "<th>Author</th>"
-            "<th>Replies</th>"
-            "</tr>"
-            "</thead>"
-            f"<tbody>{''.join(rows)}</tbody>"
-            "</table>"
-        )
-    else:
-        content_html = '<p class="notice">No threads were captured for this forum.</p>'
+    title_html = escape_repeated(forum_title)
+    folder_name = folder.get("name")
+    heading_html = escape_repeated(folder_name or "Forum")
+    forum_name_html = escape_repeated(folder_name or "Unknown")
 
-    return f"""<!DOCTYPE html>
+    yield f"""<!DOCTYPE html>
 <html lang="en">
 <head>
   <meta charset="utf-8"/>
   <meta name="viewport" content="width=device-width, initial-scale=1"/>
-  <title>{html.escape(folder.get('name') or 'Forum')} - {html.escape(forum_title)}</title>
+  <title>{heading_html} - {title_html}</title>
   <link rel="stylesheet" href="../assets/style.css"/>
 </head>
 <body class="folder-page">
   <header>
-    <h1>{html.escape(forum_title)}</h1>
-    <p>Forum: {html.escape(folder.get('name') or 'Unknown')}</p>
+    <h1>{title_html}</h1>
+    <p>Forum: {forum_name_html}</p>
   </header>
   <main>
     <section class="folder-preview">
       <div class="folder-header">
         <div>
-          <h2>{html.escape(folder.get('name') or 'Forum')}</h2>
-          <p class="folder-subtitle">{html.escape(subtitle)}</p>
+          <h2>{heading_html}</h2>
+          <p class="folder-subtitle">{subtitle.translate(HTML_ESCAPE_TABLE)}</p>
         </div>
         <a class="folder-show-all" href="../index.html">Back to Index</a>
       </div>
-      {content_html}
+      """
+
+    if threads:
+        yield (
+            '<table class="folder-table">'
+            "<thead>"
+            "<tr>"
+            "<th>Thread ID</th>"
+            "<th>Message Title</th>"
+            "<th>Date Posted</th>"
+            "<th>Author</th>"
+            "<th>Replies</th>"
+            "</tr>"
+            "</thead>"
+            "<tbody>"
+        )
+        for thread in folder["threads_by_first_date"]:
+            thread_id = str(thread.get("id")).translate(HTML_ESCAPE_TABLE)
+            title = thread["title_html"]
+            first_date = format_folder_date(thread.get("first_date"))
+            author = thread["first_author_html"] or "Unknown"
+            replies = max(thread.get("message_count", 0) - 1, 0)
+            link = f'../threads/{thread["id"]}.html'
+            yield (
+                "<tr>"
+                f'<td class="thread-id">{thread_id}</td>'
+                f'<td><a href="{link}">{title}</a></td>'
+                f"<td>{first_date}</td>"
+                f"<td>{author}</td>"
+                f"<td>{replies}</td>"
+                "</tr>"
+            )
+        yield "</tbody></table>"
+    else:
+        yield '<p class="notice">No threads were captured for this forum.</p>'
+
+    yield """
     </section>
   </main>
-  <footer>
-    Export generated on {dt.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}.
-  </footer>
-</body>
-</html>
 """
 
 
-def render_thread_html(
-    forum_title: str,
-    thread: Mapping,
-    messages_html: str,
-) -> str:
-    folder = html.escape(thread.get("folder") or "Uncategorised")
+def render_thread_header(forum_title: str, thread: Mapping) -> str:
+    """Everything of a thread page that precedes its messages."""
+    folder = escape_repeated(thread.get("folder") or "Uncategorised")
     topic = html.escape(thread.get("title") or f"Thread {thread.get('id')}")
     views = html.escape(str(thread.get("views"))) if thread.get("views") else "N/A"
     message_count = thread.get("message_count", 0)
@@ -864,7 +1085,7 @@ def render_thread_html(
 <head>
   <meta charset="utf-8"/>
   <meta name="viewport" content="width=device-width, initial-scale=1"/>
-  <title>{topic} - {html.escape(forum_title)}</title>
+  <title>{topic} - {escape_repeated(forum_title)}</title>
   <link rel="stylesheet" href="../assets/style.css"/>
 </head>
 <body>
@@ -881,23 +1102,100 @@ def render_thread_html(
         <dt>Last Updated</dt><dd>{html.escape(last_display)}</dd>
       </dl>
     </section>
-    {messages_html}
+    """
+
+
+THREAD_PAGE_FOOTER_BYTES = b"""
   </div>
 </body>
 </html>
 """
 
 
-def build_profile_lookup(profiles_dir: Path) -> Dict[str, Mapping]:
-    lookup: Dict[str, Mapping] = {}
-    if not profiles_dir.exists():
-        return lookup
+def write_file(
+    path: Union[str, Path], data: bytes, dir_fd: Optional[int] = None
+) -> None:
+    """
+    Write pre-encoded bytes with raw os calls, bypassing the io stack. With
+    dir_fd, path is resolved relative to that open directory.
+    """
+    write_chunks(path, [data], dir_fd)
 
-    for path in profiles_dir.glob("*.yaml"):
-        data = load_yaml(path)
-        key = path.stem
-        lookup[key] = data
-    return lookup
+
+def write_chunks(
+    path: Union[str, Path], chunks: Iterable[bytes], dir_fd: Optional[int] = None
+) -> None:
+    """
+    Like write_file, for content held as chunks: they go out in order with
+    vectored writes where available, without being joined first.
+    """
+    pending = [memoryview(chunk) for chunk in chunks if chunk]
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666, dir_fd=dir_fd)
+    try:
+        while pending:
+            if IOV_MAX:
+                written = os.writev(fd, pending[:IOV_MAX])
+            else:
+                written = os.write(fd, pending[0])
+            # Drop the buffers written in full, then trim a partial one.
+            done = 0
+            while done < len(pending) and written >= len(pending[done]):
+                written -= len(pending[done])
+                done += 1
+            del pending[:done]
+            if written:
+                pending[0] = pending[0][written:]
+    finally:
+        os.close(fd)
+
+
+def write_thread_html(
+    path: Path,
+    forum_title: str,
+    thread: Mapping,
+    messages: Iterable[Mapping],
+    profile_lookup: LazyProfileLookup,
+    resolve_asset: Callable[[Optional[str]], Optional[str]],
+) -> None:
+    """Stream a thread page to disk one message at a time."""
+    # Binary mode: chunks are encoded here instead of through a TextIOWrapper.
+    with path.open("wb", buffering=THREAD_WRITE_BUFFER_SIZE) as handle:
+        handle.write(render_thread_header(forum_title, thread).encode("utf-8"))
+        separator = b""
+        for message_html in iter_message_html(messages, profile_lookup, resolve_asset):
+            handle.write(separator)
+            handle.write(message_html.encode("utf-8"))
+            separator = b"\n"
+        handle.write(THREAD_PAGE_FOOTER_BYTES)
+
+
+class LazyProfileLookup:
+    """
+    Profile snapshots keyed by file stem. Each YAML file is only parsed the
+    first time a message references it, then kept for the rest of the run.
+    """
+
+    def __init__(self, profiles_dir: Path, cache_dir: Optional[str] = None) -> None:
+        self.profiles_dir = profiles_dir
+        self.cache_dir = cache_dir
+        self._profiles: Dict[str, Optional[Mapping]] = {}
+
+    def get(self, key: str, default: Optional[Mapping] = None) -> Optional[Mapping]:
+        try:
+            profile = self._profiles[key]
+        except KeyError:
+            path = os.path.join(self.profiles_dir, f"{key}.yaml")
+            profile = None
+            if os.path.isfile(path):
+                profile = load_yaml(path, self.cache_dir)
+            self._profiles[key] = profile
+        return default if profile is None else profile
+
+    def __getitem__(self, key: str) -> Mapping:
+        profile = self.get(key)
+        if profile is None:
+            raise KeyError(key)
+        return profile
 
 
 def profile_key_from_name(name: Optional[str]) -> Optional[str]:
@@ -920,18 +1218,33 @@ def describe_profile(profile: Optional[Mapping]) -> str:
     return '<div class="profile-meta">' + " | ".join(details) + "</div>"
 
 
-def render_messages(
+@functools.lru_cache(maxsize=1024)
+def _url_pattern(urls: tuple) -> re.Pattern:
+    # Longest first so a URL that prefixes another cannot shadow it.
+    ordered = sorted(urls, key=len, reverse=True)
+    return re.compile("|".join(re.escape(url) for url in ordered))
+
+
+def replace_image_urls(content_html: str, replacements: Mapping[str, str]) -> str:
+    """Rewrite every remote image URL in one pass over the message body."""
+    if len(replacements) == 1:
+        (url, local), = replacements.items()
+        return content_html.replace(url, local)
+    pattern = _url_pattern(tuple(replacements))
+    return pattern.sub(lambda match: replacements[match.group(0)], content_html)
+
+
+def iter_message_html(
     messages: Iterable[Mapping],
-    profile_lookup: Mapping[str, Mapping],
-    store_files: Path,
-    export_files: Path,
-) -> str:
+    profile_lookup: LazyProfileLookup,
+    resolve_asset: Callable[[Optional[str]], Optional[str]],
+) -> Iterator[str]:
     messages = list(messages)
     total = len(messages)
     if not total:
-        return '<p class="notice">No messages were captured for this thread.</p>'
+        yield '<p class="notice">No messages were captured for this thread.</p>'
+        return
 
-    rendered: List[str] = []
     for index, msg in enumerate(messages, start=1):
         mid = msg.get("id") or "unknown"
         anchor = f"msg-{mid.replace('.', '-')}"
@@ -944,13 +1257,13 @@ def render_messages(
             raw_recipient, "msg-recipient-name", msg.get("to_status")
         )
         posted_raw = msg.get("date") or ""
-        posted_dt = parse_date(posted_raw)
+        posted_dt = msg["_date"]
         date_display = format_date_short(posted_dt) if posted_dt else posted_raw
         time_display = format_time_component(posted_dt) if posted_dt else ""
         timestamp_text = date_display.strip()
         if time_display:
             timestamp_text = f"{timestamp_text} {time_display}"
-        timestamp_html = html.escape(timestamp_text)
+        timestamp_html = timestamp_text.translate(HTML_ESCAPE_TABLE)
 
         content_html = msg.get("content") or ""
         attachments_html = ""
@@ -958,12 +1271,12 @@ def render_messages(
 
         for attachment in msg.get("attachments") or []:
             href = attachment.get("href")
-            local = ensure_local_asset(href, store_files, export_files)
+            local = resolve_asset(href)
             link_target = local or href
             label = attachment.get("name") or href
-            label_text = html.escape(label)
+            label_text = label.translate(HTML_ESCAPE_TABLE)
             size = attachment.get("size")
-            size_text = f" ({html.escape(size)})" if size else ""
+            size_text = f" ({size.translate(HTML_ESCAPE_TABLE)})" if size else ""
             if local:
                 attachment_items.append(
                     f'<li><a href="../{link_target}" download>{label_text}</a>{size_text}</li>'
@@ -981,79 +1294,274 @@ def render_messages(
                 "</div>"
             )
 
+        image_paths: Dict[str, str] = {}
         for image_url in msg.get("images") or []:
-            local_image = ensure_local_asset(image_url, store_files, export_files)
+            local_image = resolve_asset(image_url)
             if local_image:
-                content_html = content_html.replace(image_url, f"../{local_image}")
+                image_paths[image_url] = f"../{local_image}"
+        if image_paths and content_html:
+            content_html = replace_image_urls(content_html, image_paths)
 
         pk = profile_key_from_name(msg.get("from"))
         profile_html = ""
         if pk:
             profile_html = describe_profile(profile_lookup.get(pk))
 
-        seq_link = f'<a href="#{anchor}">{index} of {total}</a>'
-        top_row_parts = [
-            '<span class="msg-label msg-from">From: '
-            f"{author_html}"
-            "</span>"
-        ]
-        if timestamp_html:
-            top_row_parts.append(
-                f'<span class="msg-date-time">{timestamp_html}</span>'
-            )
-
-        bottom_row_parts = [
-            '<span class="msg-label msg-to">To: '
-            f"{recipient_html}"
-            "</span>",
-            f'<span class="msg-seq">({seq_link})</span>',
-        ]
+        timestamp_span = (
+            f'<span class="msg-date-time">{timestamp_html}</span>'
+            if timestamp_html
+            else ""
+        )
+        # mid always has a value, so the thread reference line is never empty.
+        mid_html = mid.translate(HTML_ESCAPE_TABLE)
+        reply_to = msg.get("in_reply_to")
+        reply_html = (
+            f' in reply to <a href="#msg-{reply_to.replace(".", "-")}">'
+            f"{escape_repeated(reply_to)}</a>"
+            if reply_to
+            else ""
+        )
 
-        header_html = (
+        yield (
+            f'<article class="message" id="{anchor}">'
             '<header class="message-header">'
             '<div class="msg-row msg-row-top">'
-            + "".join(top_row_parts)
-            + "</div>"
+            f'<span class="msg-label msg-from">From: {author_html}</span>'
+            f"{timestamp_span}"
+            "</div>"
             '<div class="msg-row msg-row-bottom">'
-            + "".join(bottom_row_parts)
-            + "</div>"
+            f'<span class="msg-label msg-to">To: {recipient_html}</span>'
+            f'<span class="msg-seq">(<a href="#{anchor}">{index} of {total}</a>)</span>'
+            "</div>"
             "</header>"
+            '<div class="message-body">'
+            f'<div class="msg-thread-ref"><strong>{mid_html}</strong>{reply_html}</div>'
+            f'<div class="message-content">{content_html}</div>'
+            f"{profile_html}"
+            f"{attachments_html}"
+            "</div>"
+            "</article>"
         )
 
-        thread_ref_parts: List[str] = []
-        if mid:
-            thread_ref_parts.append(f"<strong>{html.escape(mid)}</strong>")
-        reply_to = msg.get("in_reply_to")
-        if reply_to:
-            reply_anchor = f"msg-{reply_to.replace('.', '-')}"
-            thread_ref_parts.append(
-                f'in reply to <a href="#{reply_anchor}">{html.escape(reply_to)}</a>'
-            )
-        thread_ref_html = (
-            f'<div class="msg-thread-ref">{" ".join(thread_ref_parts)}</div>'
-            if thread_ref_parts
-            else ""
+
+def process_thread(
+    yaml_path: str,
+    args: argparse.Namespace,
+    resolve_asset: Callable[[Optional[str]], Optional[str]],
+    export_threads_dir: Path,
+    profile_lookup: LazyProfileLookup,
+    cache_dir: Optional[str] = None,
+) -> Optional[Dict]:
+    """Render a single thread page and return its summary for the index."""
+    data = load_yaml(yaml_path, cache_dir)
+    processed_messages = list(data.get("messages") or [])
+    if not processed_messages:
+        return None
+
+    # Parse every stamp once; the renderer reads the result back from "_date".
+    for message in processed_messages:
+        message["_date"] = parse_date(message.get("date"))
+    first_date = processed_messages[0]["_date"]
+    last_date = processed_messages[-1]["_date"]
+
+    metadata = data.get("metadata") or {}
+    file_id = os.path.basename(yaml_path)[: -len(".yaml")]
+    thread_id = str(data.get("thead_id") or file_id)
+    title = metadata.get("topic") or f"Thread {thread_id}"
+    folder = metadata.get("folder") or "Uncategorised"
+    views = metadata.get("views")
+    folder_slug = slugify(folder)
+
+    first_message = processed_messages[0]
+    snippet = build_snippet(first_message.get("content"))
+    first_author = first_message.get("from")
+    message_count = len(processed_messages)
+
+    write_thread_html(
+        export_threads_dir / f"{thread_id}.html",
+        args.forum_title,
+        {
+            "id": thread_id,
+            "title": title,
+            "folder": folder,
+            "views": views,
+            "message_count": message_count,
+            "first_date": first_date,
+            "last_date": last_date,
+        },
+        processed_messages,
+        profile_lookup,
+        resolve_asset,
+    )
+
+    return {
+        "id": thread_id,
+        "title": title,
+        "folder": folder,
+        "folder_slug": folder_slug,
+        "views": views,
+        "message_count": message_count,
+        "first_date": first_date,
+        # Float sort key for folder pages; undated threads sort last.
+        "first_date_ts": (
+            (first_date - EPOCH).total_seconds() if first_date else math.inf
+        ),
+        "last_date": last_date,
+        # Likewise for the index, which lists the most recent activity first.
+        "last_date_ts": (
+            (last_date - EPOCH).total_seconds() if last_date else -math.inf
+        ),
+        # Escaped here, in the workers, so the index and folder pages can
+        # interpolate them as they are.
+        "title_html": title.translate(HTML_ESCAPE_TABLE),
+        "first_author_html": escape_repeated(first_author) if first_author else "",
+        "snippet_html": snippet.translate(HTML_ESCAPE_TABLE),
+    }
+
+
+def assemble_folders(threads: List[Dict]) -> List[Dict]:
+    """Group thread summaries into folders sorted by name for the index."""
+    # Summaries arrive unpickled from the workers with a private copy of every
+    # folder name and slug; interning shares one string per folder, which also
+    # lets pickle send each once per chunk when folder pages go back out.
+    # process_thread has already defaulted the folder and computed its slug.
+    for thread in threads:
+        thread["folder"] = sys.intern(thread["folder"])
+        thread["folder_slug"] = sys.intern(thread["folder_slug"])
+
+    folder_key = operator.itemgetter("folder")
+    # Position of each folder's first thread. Sorting groups by name loses it,
+    # and names that casefold alike ("News", "news") keep that order.
+    first_seen = {
+        name: index
+        for index, name in enumerate(dict.fromkeys(map(folder_key, threads)))
+    }
+    folders: List[Dict] = []
+    for folder_name, group in itertools.groupby(
+        sorted(threads, key=folder_key), key=folder_key
+    ):
+        folder_threads = list(group)
+        folder_slug = folder_threads[0]["folder_slug"]
+        folder_threads.sort(key=operator.itemgetter("last_date_ts", "id"), reverse=True)
+        folders.append(
+            {
+                "name": folder_name,
+                "sort_name": folder_name.casefold(),
+                "first_seen": first_seen[folder_name],
+                "slug": folder_slug,
+                "threads": folder_threads,
+                # Folder pages list threads oldest first.
+                "threads_by_first_date": sorted(
+                    folder_threads, key=operator.itemgetter("first_date_ts", "id")
+                ),
+            }
         )
 
-        body_sections: List[str] = []
-        if thread_ref_html:
-            body_sections.append(thread_ref_html)
-        if content_html:
-            body_sections.append(f'<div class="message-content">{content_html}</div>')
-        else:
-            body_sections.append('<div class="message-content"></div>')
-        if profile_html:
-            body_sections.append(profile_html)
-        if attachments_html:
-            body_sections.append(attachments_html)
-
-        rendered.append(
-            f'<article class="message" id="{anchor}">'
-            f"{header_html}"
-            f'<div class="message-body">{"".join(body_sections)}</div>'
-            "</article>"
+    folders.sort(key=operator.itemgetter("sort_name", "first_seen"))
+
+    # Names that differ only in case or punctuation ("News", "news") slugify
+    # alike; later folders get a numbered page so none overwrites another.
+    base_slugs = {folder["slug"] for folder in folders}
+    used_slugs: Set[str] = set()
+    for folder in folders:
+        slug = folder["slug"]
+        if slug in used_slugs:
+            suffix = 2
+            while f"{slug}-{suffix}" in used_slugs or f"{slug}-{suffix}" in base_slugs:
+                suffix += 1
+            folder["slug"] = slug = f"{slug}-{suffix}"
+        used_slugs.add(slug)
+    return folders
+
+
+@functools.lru_cache(maxsize=None)
+def open_directory(path: str) -> int:
+    """Directory fd held for the life of the process, for dir_fd relative writes."""
+    return os.open(path, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+
+
+def page_digest(chunks: Iterable[bytes]) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for chunk in chunks:
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_manifest(path: Path) -> Dict[str, str]:
+    """Digests of the pages written by the previous export, keyed by path."""
+    try:
+        with open(path, "rb") as handle:
+            manifest = _json_loads(handle.read())
+    except (OSError, ValueError):
+        return {}
+    return manifest if isinstance(manifest, dict) else {}
+
+
+def batch_size(task_count: int, workers: int, minimum: int = 1) -> int:
+    """
+    Tasks per pool dispatch: about four batches per worker, so the fixed
+    pickling and IPC cost per dispatch is shared by many pages while the
+    load still balances across workers.
+    """
+    return max(minimum, task_count // (workers * 4))
+
+
+def write_folder_page(
+    folder: Mapping,
+    previous_digest: Optional[str],
+    *,
+    forum_title: str,
+    generated_at: str,
+    out_dir: str,
+) -> str:
+    """
+    Write a folder page unless its content matches previous_digest, and
+    return the new digest. The digest leaves out the timestamp footer, so an
+    unchanged folder keeps the page (and date) from the export that wrote it.
+    """
+    chunks = [chunk.encode("utf-8") for chunk in iter_folder_html(forum_title, folder)]
+    digest = page_digest(chunks)
+    name = f"{folder['slug']}.html"
+    if DIR_FD_SUPPORTED:
+        # Skips resolving the folders/ path again for every page.
+        path, dir_fd = name, open_directory(out_dir)
+    else:
+        path, dir_fd = f"{out_dir}{os.sep}{name}", None
+
+    if digest == previous_digest:
+        try:
+            os.stat(path, dir_fd=dir_fd)
+            return digest
+        except FileNotFoundError:
+            pass
+
+    chunks.append(render_page_footer(generated_at).encode("utf-8"))
+    write_chunks(path, chunks, dir_fd)
+    return digest
+
+
+def list_thread_files(threads_dir: Path) -> List[str]:
+    """Thread YAML paths in name order, read straight from the directory entries."""
+    with os.scandir(threads_dir) as entries:
+        return sorted(
+            entry.path
+            for entry in entries
+            if entry.name.endswith(".yaml") and entry.is_file()
         )
-    return "\n".join(rendered)
+
+
+# Per-process state installed by the pool initializer so the read-only
+# arguments of process_thread are pickled once per worker, not once per task.
+_WORKER_CONTEXT: Dict[str, object] = {}
+
+
+def _init_worker(context: Dict[str, object]) -> None:
+    _WORKER_CONTEXT.clear()
+    _WORKER_CONTEXT.update(context)
+
+
+def _process_thread_in_worker(yaml_path: str) -> Optional[Dict]:
+    return process_thread(yaml_path, **_WORKER_CONTEXT)
 
 
 def main() -> None:
@@ -1081,98 +1589,69 @@ def main() -> None:
 
     # Write CSS asset.
     css_path = export_assets_dir / "style.css"
-    css_path.write_text(STYLE_CSS, encoding="utf-8")
-
-    profile_lookup = build_profile_lookup(profiles_dir)
-
-    threads: List[Dict] = []
-    for yaml_path in sorted(threads_dir.glob("*.yaml")):
-        data = load_yaml(yaml_path)
-        processed_messages = list(data.get("messages") or [])
-        if not processed_messages:
-            continue
-
-        first_date = parse_date(processed_messages[0].get("date"))
-        last_date = parse_date(processed_messages[-1].get("date"))
-
-        metadata = data.get("metadata") or {}
-        thread_id = str(data.get("thead_id") or yaml_path.stem)
-        title = metadata.get("topic") or f"Thread {thread_id}"
-        folder = metadata.get("folder") or "Uncategorised"
-        views = metadata.get("views")
-        folder_slug = slugify(folder)
-
-        first_message = processed_messages[0]
-        snippet = build_snippet(first_message.get("content"))
-        first_author = first_message.get("from")
-        message_count = len(processed_messages)
-
-        rendered_messages = render_messages(
-            processed_messages, profile_lookup, files_dir, export_files_dir
-        )
-        thread_html = render_thread_html(
-            args.forum_title,
-            {
-                "id": thread_id,
-                "title": title,
-                "folder": folder,
-                "views": views,
-                "message_count": message_count,
-                "first_date": first_date,
-                "last_date": last_date,
-            },
-            rendered_messages,
-        )
-
-        thread_output_path = export_threads_dir / f"{thread_id}.html"
-        thread_output_path.write_text(thread_html, encoding="utf-8")
-
-        threads.append(
-            {
-                "id": thread_id,
-                "title": title,
-                "folder": folder,
-                "folder_slug": folder_slug,
-                "views": views,
-                "message_count": message_count,
-                "first_date": first_date,
-                "last_date": last_date,
-                "first_author": first_author,
-                "snippet": snippet,
-            }
-        )
-
-    # Assemble folder view for index.
-    folders: Dict[str, Dict] = {}
-    for thread in threads:
-        folder_name = thread["folder"] or "Uncategorised"
-        folder_slug = thread.get("folder_slug") or slugify(folder_name)
-        bucket = folders.setdefault(
-            folder_name,
-            {"name": folder_name, "slug": folder_slug, "threads": []},
+    write_file(css_path, STYLE_CSS_COMPACT.encode("utf-8"))
+
+    thread_cache_dir = profile_cache_dir = None
+    if args.cache_format == "json":
+        cache_root = export_root / CACHE_DIR_NAME
+        (cache_root / "threads").mkdir(parents=True, exist_ok=True)
+        (cache_root / "profiles").mkdir(parents=True, exist_ok=True)
+        thread_cache_dir = os.fspath(cache_root / "threads")
+        profile_cache_dir = os.fspath(cache_root / "profiles")
+
+    profile_lookup = LazyProfileLookup(profiles_dir, profile_cache_dir)
+
+    store_hashes = list_file_names(files_dir)
+    mirror_store_files(files_dir, export_files_dir, store_hashes, args.copy_mode)
+
+    worker_context = {
+        "args": args,
+        "resolve_asset": functools.partial(
+            ensure_local_asset, store_hashes=store_hashes
+        ),
+        "export_threads_dir": export_threads_dir,
+        "profile_lookup": profile_lookup,
+        "cache_dir": thread_cache_dir,
+    }
+    with ProcessPoolExecutor(
+        max_workers=args.jobs,
+        initializer=_init_worker,
+        initargs=(worker_context,),
+    ) as executor:
+        summaries = executor.map(
+            _process_thread_in_worker, list_thread_files(threads_dir), chunksize=16
         )
-        bucket.setdefault("slug", folder_slug)
-        bucket["threads"].append(thread)
-
-    for folder in folders.values():
-        folder["threads"].sort(
-            key=lambda t: (t["last_date"] or dt.datetime.min, t["id"]), reverse=True
+        threads: List[Dict] = [summary for summary in summaries if summary]
+
+        folder_sections = assemble_folders(threads)
+        generated_at = dt.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        manifest_path = export_root / MANIFEST_NAME
+        previous_manifest = load_manifest(manifest_path)
+        page_names = [f"folders/{folder['slug']}.html" for folder in folder_sections]
+        # Only sizes batches; the executor picks its own default worker count.
+        workers = args.jobs if args.jobs is not None else os.cpu_count() or 1
+        # Folder pages render in the workers while the index renders here.
+        folder_digests = executor.map(
+            functools.partial(
+                write_folder_page,
+                forum_title=args.forum_title,
+                generated_at=generated_at,
+                out_dir=os.fspath(export_folders_dir),
+            ),
+            folder_sections,
+            [previous_manifest.get(name) for name in page_names],
+            chunksize=batch_size(len(folder_sections), workers, minimum=8),
         )
-
-    folder_sections = sorted(folders.values(), key=lambda item: item["name"].lower())
-    index_html = render_index_html(
-        args.forum_title,
-        "Offline snapshot generated from Delphi Forums scrape.",
-        folder_sections,
-    )
-
-    for folder in folder_sections:
-        folder_page_html = render_folder_html(args.forum_title, folder)
-        (export_folders_dir / f"{folder['slug']}.html").write_text(
-            folder_page_html, encoding="utf-8"
+        index_html = render_index_html(
+            args.forum_title,
+            "Offline snapshot generated from Delphi Forums scrape.",
+            folder_sections,
+            generated_at,
         )
+        write_file(export_root / "index.html", index_html.encode("utf-8"))
+        manifest = dict(zip(page_names, folder_digests))
 
-    (export_root / "index.html").write_text(index_html, encoding="utf-8")
+    write_file(manifest_path, _json_dumps(manifest))
 
 
 if __name__ == "__main__":